@@ -3,22 +3,27 @@ TheWhisper Backend Server for Twake Assistant
 FastAPI server for real-time speech-to-text transcription
 """
 
-import base64
+import asyncio
+import binascii
 import os
+import secrets
 import signal
 import sys
-import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Whisper imports - using faster-whisper for CPU/GPU compatibility
 try:
-    from faster_whisper import WhisperModel
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+    from faster_whisper.vad import get_speech_timestamps
     import librosa
     PLATFORM_AVAILABLE = True
     print("✅ faster-whisper loaded successfully")
@@ -28,6 +33,11 @@ except ImportError as e:
 
 platform = os.getenv("PLATFORM", "cpu").lower()
 
+# Fixed for the process lifetime - the hot path compares integer sample counts
+SAMPLE_RATE = 16000  # Whisper requires 16kHz
+CHUNK_LENGTH_S = int(os.getenv("CHUNK_LENGTH_S", "15"))
+CHUNK_SAMPLES = SAMPLE_RATE * CHUNK_LENGTH_S
+
 
 # ============================================================================
 # Models
@@ -51,6 +61,104 @@ class TranscriptionResponse(BaseModel):
     uncommitted: List[Word]
 
 
+# ============================================================================
+# Audio Buffers
+# ============================================================================
+
+# Wire encodings for raw PCM chunks: little-endian float32 or int16
+AUDIO_ENCODINGS = {"f32": np.float32, "s16": np.int16}
+ENCODING_PATTERN = f"^({'|'.join(AUDIO_ENCODINGS)})$"
+
+# Maps int16 PCM onto Whisper's [-1.0, 1.0) float range
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def pcm_view(audio_bytes: bytes, encoding: str) -> np.ndarray:
+    """Zero-copy view of a raw PCM chunk in its wire dtype"""
+    dtype = AUDIO_ENCODINGS.get(encoding)
+    if dtype is None:
+        raise ValueError(f"Unsupported audio encoding: {encoding}")
+
+    if not audio_bytes:
+        raise ValueError("Empty audio chunk")
+
+    itemsize = np.dtype(dtype).itemsize
+    if len(audio_bytes) % itemsize:
+        raise ValueError(
+            f"Audio chunk of {len(audio_bytes)} bytes is not a whole number of {encoding} samples"
+        )
+    return np.frombuffer(audio_bytes, dtype=dtype)
+
+
+def store_pcm(samples: np.ndarray, out: np.ndarray):
+    """Convert PCM samples to float32 into `out`"""
+    if samples.dtype == np.int16:
+        # Cast and scale in one vectorized pass
+        np.multiply(samples, INT16_SCALE, out=out, casting="unsafe")
+    else:
+        np.copyto(out, samples)
+
+
+def ring_write(ring: np.ndarray, idx: int, samples: np.ndarray):
+    """Write samples into a ring buffer starting at absolute sample index `idx`"""
+    start = idx % ring.size
+    first = min(samples.size, ring.size - start)
+    store_pcm(samples[:first], ring[start:start + first])
+    store_pcm(samples[first:], ring[:samples.size - first])
+
+
+def ring_read(ring: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Audio between absolute sample indices - a view unless it wraps around"""
+    head = start % ring.size
+    tail = head + (end - start)
+    if tail <= ring.size:
+        return ring[head:tail]
+    return np.concatenate((ring[head:], ring[:tail - ring.size]))
+
+
+# ============================================================================
+# Sessions
+# ============================================================================
+
+class SessionNotFoundError(ValueError):
+    """Raised for unknown session ids (other ValueErrors are bad requests)"""
+
+
+class Session:
+    """State of one transcription session"""
+
+    __slots__ = (
+        "language", "active", "ring", "write_idx", "read_idx", "transcribing", "generation",
+        "committed_text", "last_processed_idx",
+        "cached_response", "cached_not_ready", "lock"
+    )
+
+    def __init__(self, language: str, ring: np.ndarray):
+        self.language = language
+        self.active = True
+        self.ring = ring  # Accumulate audio here
+        self.write_idx = 0  # Absolute index of the next sample written
+        self.read_idx = 0  # Absolute index of the first untranscribed sample
+        self.transcribing = False  # A window is being transcribed
+        self.generation = 0  # Bumped by clear_session to drop in-flight results
+        self.committed_text: List[str] = []  # Finalized transcription
+        self.last_processed_idx = 0  # write_idx of cached_response, -1 when stale
+        self.cached_response = TranscriptionResponse(committed=[], uncommitted=[])
+        # Served while the next window fills; rebuilt only when committed_text changes
+        self.cached_not_ready = TranscriptionResponse(committed=[], uncommitted=[])
+        self.lock = threading.Lock()  # Guards buffers against the transcribe pool
+
+    def commit(self, texts: List[str]):
+        """Append finalized text and rebuild the not-ready response"""
+        self.committed_text.extend(texts)
+        # Whoever committed (process or stream), the cached response is now stale
+        self.last_processed_idx = -1
+        self.cached_not_ready = TranscriptionResponse(
+            committed=[Word(text=text, timestamp=None) for text in self.committed_text],
+            uncommitted=[]
+        )
+
+
 # ============================================================================
 # Streaming Manager
 # ============================================================================
@@ -58,193 +166,364 @@ class TranscriptionResponse(BaseModel):
 class StreamingManager:
     """Manages concurrent transcription sessions using faster-whisper"""
 
-    def __init__(self, model_name: str, chunk_length_s: int = 15):
+    def __init__(self, model_name: str):
         self.model_name = model_name
-        self.chunk_length_s = chunk_length_s
-        self.sample_rate = 16000  # Whisper requires 16kHz
-        self.sessions: Dict[str, dict] = {}
+        # For introspection only - processing uses the module constants
+        self.chunk_length_s = CHUNK_LENGTH_S
+        self.sample_rate = SAMPLE_RATE
+        self.sessions: Dict[str, Session] = {}
+        # Word-level timestamps cost an extra alignment pass per window
+        self.stream_word_timestamps = os.getenv("STREAM_WORD_TIMESTAMPS", "0") == "1"
+        # Two windows of headroom so chunks keep arriving during transcription
+        self.ring_size = 2 * CHUNK_SAMPLES
 
         # Load Whisper model once
         if PLATFORM_AVAILABLE:
             print(f"Loading Whisper model: {model_name}...")
-            # Use base, small, medium, or large-v3
+            # Use base, small, medium, large-v3, or the faster large-v3 variants
             # For faster-whisper, we use model names like "base", "small", "medium", "large-v3"
             model_size = "base"  # Start with base for faster loading
-            if "large" in model_name:
+            if "distil" in model_name:
+                model_size = "distil-large-v3"  # English only
+            elif "turbo" in model_name:
+                model_size = "large-v3-turbo"
+            elif "large" in model_name:
                 model_size = "large-v3"
             elif "medium" in model_name:
                 model_size = "medium"
             elif "small" in model_name:
                 model_size = "small"
 
-            self.model = WhisperModel(model_size, device="cpu", compute_type="int8")
-            print(f"✅ Model {model_size} loaded successfully")
+            # "auto" picks the fastest type for the device (int8 on CPU, int8_float16 on GPU)
+            device = os.getenv("WHISPER_DEVICE", "cpu")
+            compute_type = os.getenv("COMPUTE_TYPE", "auto")
+            self.model = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=int(os.getenv("CPU_THREADS", "0")),
+                num_workers=int(os.getenv("NUM_WORKERS", "1"))
+            )
+            print(f"✅ Model {model_size} loaded successfully ({device}, {compute_type})")
+
+            # Opt-in: batch the VAD speech chunks of a single window through the
+            # encoder; concurrent sessions are still separate transcribe calls
+            self.batch_size = int(os.getenv("BATCH_SIZE", "1"))
+            if self.batch_size > 1:
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+            else:
+                self.pipeline = None
+            # The pipeline keeps word alignment state on the instance, shared by all threads
+            self.pipeline_lock = threading.Lock()
+
+            self._warmup()
         else:
             self.model = None
+            self.pipeline = None
+
+    def _warmup(self):
+        """Run a throwaway transcription so the first session skips the cold start"""
+        # Straight to the model without VAD, which would drop silence before the encoder
+        segments, _ = self.model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32),
+            language="en",
+            beam_size=1
+        )
+        list(segments)
+
+        # Every real request runs with vad_filter=True, which loads Silero VAD lazily
+        get_speech_timestamps(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        print("✅ Model and VAD warmed up")
+
+    def _transcribe(self, audio: np.ndarray, **options):
+        """Run transcription, batched through the pipeline when enabled"""
+        if not self.pipeline:
+            return self.model.transcribe(audio, **options)
+
+        # The pipeline only decodes at the first temperature - no fallback
+        temperature = options.get("temperature")
+        if isinstance(temperature, list):
+            options["temperature"] = temperature[0]
+
+        if not options.get("word_timestamps"):
+            return self.pipeline.transcribe(audio, batch_size=self.batch_size, **options)
+
+        # Segments are decoded lazily, so hold the lock until all are aligned
+        with self.pipeline_lock:
+            segments, info = self.pipeline.transcribe(audio, batch_size=self.batch_size, **options)
+            return list(segments), info
 
     def create_session(self, language: str = "en") -> str:
         """Create a new transcription session"""
-        session_id = base64.b64encode(uuid.uuid4().bytes).decode('utf-8').rstrip('=')
+        session_id = secrets.token_urlsafe(16)  # URL-safe, used in endpoint paths
 
         if not PLATFORM_AVAILABLE:
             raise RuntimeError("Whisper platform not available")
 
-        self.sessions[session_id] = {
-            "language": language,
-            "active": True,
-            "audio_buffer": np.array([], dtype=np.float32),  # Accumulate audio here
-            "transcribed_length": 0,  # Track how much we've transcribed
-            "committed_text": [],  # Finalized transcription
-            "last_transcription": ""  # Last uncommitted chunk
-        }
+        self.sessions[session_id] = Session(
+            language=language,
+            ring=np.zeros(self.ring_size, dtype=np.float32)
+        )
 
         print(f"✅ Session created: {session_id} (language: {language})")
         return session_id
 
-    def add_chunk(self, session_id: str, audio_base64: str):
-        """Add audio chunk to session buffer"""
-        if session_id not in self.sessions:
-            raise ValueError(f"Session {session_id} not found")
-
-        # Decode base64 audio
-        audio_bytes = base64.b64decode(audio_base64)
-        audio_array = np.frombuffer(audio_bytes, dtype=np.float32)
-
-        # Append to buffer
-        session = self.sessions[session_id]
-        session["audio_buffer"] = np.concatenate([session["audio_buffer"], audio_array])
+    def add_chunk(self, session_id: str, audio_base64: Union[str, bytes], encoding: str = "f32"):
+        """Add base64-encoded audio chunk to session buffer"""
+        # binascii is the C decoder behind base64.b64decode, minus its Python-level wrapper
+        try:
+            audio_bytes = binascii.a2b_base64(audio_base64)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 audio: {e}")
+        self.add_chunk_bytes(session_id, audio_bytes, encoding)
+
+    def add_chunk_bytes(self, session_id: str, audio_bytes: bytes, encoding: str = "f32"):
+        """Add raw PCM audio chunk (see AUDIO_ENCODINGS) to session buffer"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+
+        samples = pcm_view(audio_bytes, encoding)
+
+        # Convert straight into the ring, resizing it to the untranscribed backlog
+        with session.lock:
+            pending = session.write_idx - session.read_idx
+            if pending + samples.size > session.ring.size:
+                size = session.ring.size
+                while size < pending + samples.size:
+                    size *= 2
+                self._resize_ring(session, size)
+            elif session.ring.size > self.ring_size and pending + samples.size <= self.ring_size:
+                # Backlog drained - give back the memory of an earlier growth
+                self._resize_ring(session, self.ring_size)
+            ring_write(session.ring, session.write_idx, samples)
+            session.write_idx += samples.size
+
+    def _resize_ring(self, session: Session, size: int):
+        """Reallocate the session ring, keeping untranscribed audio in place"""
+        # A window being transcribed keeps reading from the old array
+        pending = ring_read(session.ring, session.read_idx, session.write_idx)
+        ring = np.zeros(size, dtype=np.float32)
+        ring_write(ring, session.read_idx, pending)
+        session.ring = ring
+
+    def _claim_window(self, session: Session) -> Optional[Tuple[np.ndarray, int, int]]:
+        """
+        Claim the pending window for transcription once it is long enough
+
+        Returns the audio, the window end and the session generation it belongs to.
+        """
+        # Caller holds session.lock
+        start, end = session.read_idx, session.write_idx
+
+        # One transcription per session at a time; chunks keep arriving meanwhile
+        if end - start < CHUNK_SAMPLES or session.transcribing:
+            return None
+        session.transcribing = True
+        return ring_read(session.ring, start, end), end, session.generation
+
+    def _transcribe_window(
+        self, session: Session, audio_buffer: np.ndarray, end: int, generation: int
+    ) -> Iterator[Word]:
+        """
+        Transcribe a claimed window, yielding words as each segment completes
+
+        The window is committed only after the last segment, so on failure
+        the words already yielded will be produced again by the retry.
+        """
+        try:
+            segments, info = self._transcribe(
+                audio_buffer,
+                language=session.language,
+                beam_size=1,  # Faster
+                best_of=1,
+                temperature=[0.0, 0.2, 0.4],  # Fallback breaks repetition loops
+                word_timestamps=self.stream_word_timestamps,
+                vad_filter=True,  # Skip silence before the encoder runs
+                vad_parameters=dict(min_silence_duration_ms=500)
+            )
+
+            # Segments are decoded lazily, one at a time
+            all_text = []
+            for segment in segments:
+                text = segment.text.strip()
+                if text:
+                    all_text.append(text)
+
+                    # Create words from segment
+                    if hasattr(segment, 'words') and segment.words:
+                        for word_info in segment.words:
+                            yield Word(
+                                text=word_info.word.strip(),
+                                timestamp=[word_info.start, word_info.end]
+                            )
+                    else:
+                        # No word timestamps, just add the whole segment
+                        # (the default while streaming)
+                        yield Word(
+                            text=text,
+                            timestamp=[segment.start, segment.end]
+                        )
+
+            # Update session, unless it was cleared while transcribing
+            with session.lock:
+                if session.generation == generation:
+                    session.commit(all_text)
+                    session.read_idx = end
+
+        except Exception as e:
+            # The window stays in the ring, so the next call retries it
+            print(f"⚠️ Transcription error: {e}")
+
+        finally:
+            with session.lock:
+                session.transcribing = False
+                # Polls made while transcribing cached a not-ready response;
+                # drop it so a failed window is retried without waiting for new audio
+                session.last_processed_idx = -1
+
+    def _cached_response(self, session: Session) -> Optional[TranscriptionResponse]:
+        """Response for a poll with no window to transcribe, None when one is ready"""
+        # Caller holds session.lock
+        # No new audio since the last call - reuse its response
+        if session.write_idx == session.last_processed_idx:
+            return session.cached_response
+
+        if session.write_idx - session.read_idx >= CHUNK_SAMPLES and not session.transcribing:
+            return None
+
+        # Not enough audio yet - return previous results, cached under
+        # the same lock so a concurrent commit cannot leave them stale
+        session.last_processed_idx = session.write_idx
+        session.cached_response = session.cached_not_ready
+        return session.cached_response
+
+    def poll(self, session_id: str) -> Optional[TranscriptionResponse]:
+        """
+        Non-blocking part of process(): the current results, or None when a
+        window is ready and process() has to transcribe it
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+
+        with session.lock:
+            return self._cached_response(session)
 
     def process(self, session_id: str) -> TranscriptionResponse:
         """Get current transcription results"""
-        if session_id not in self.sessions:
-            raise ValueError(f"Session {session_id} not found")
-
-        session = self.sessions[session_id]
-        audio_buffer = session["audio_buffer"]
-        language = session["language"]
-
-        # Calculate buffer length in seconds
-        buffer_length_s = len(audio_buffer) / self.sample_rate
-
-        committed = []
-        uncommitted = []
-
-        # If we have enough audio, transcribe
-        if buffer_length_s >= self.chunk_length_s:
-            # Transcribe the entire buffer
-            try:
-                segments, info = self.model.transcribe(
-                    audio_buffer,
-                    language=language,
-                    beam_size=1,  # Faster
-                    best_of=1,
-                    temperature=0.0,
-                    word_timestamps=True
-                )
-
-                # Collect all segments
-                all_text = []
-                for segment in segments:
-                    text = segment.text.strip()
-                    if text:
-                        all_text.append(text)
-
-                        # Create words from segment
-                        if hasattr(segment, 'words') and segment.words:
-                            for word_info in segment.words:
-                                committed.append(Word(
-                                    text=word_info.word.strip(),
-                                    timestamp=[word_info.start, word_info.end]
-                                ))
-                        else:
-                            # No word timestamps, just add the whole segment
-                            committed.append(Word(
-                                text=text,
-                                timestamp=[segment.start, segment.end]
-                            ))
-
-                # Update session
-                session["committed_text"].extend(all_text)
-                session["last_transcription"] = " ".join(all_text)
-
-                # Clear buffer after transcription
-                session["audio_buffer"] = np.array([], dtype=np.float32)
-
-            except Exception as e:
-                print(f"⚠️ Transcription error: {e}")
-
-        else:
-            # Not enough audio yet - return previous results
-            for text in session["committed_text"]:
-                committed.append(Word(text=text, timestamp=None))
-
-        return TranscriptionResponse(committed=committed, uncommitted=uncommitted)
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+
+        with session.lock:
+            response = self._cached_response(session)
+            if response is not None:
+                return response
+            window = self._claim_window(session)
+
+        # Transcribe the entire buffer; the commit invalidates the cache, so the
+        # next call without new audio serves the full committed text
+        committed = list(self._transcribe_window(session, *window))
+
+        with session.lock:
+            # Cleared while transcribing - don't hand back the discarded words
+            if session.generation != window[2]:
+                return session.cached_not_ready
+        return TranscriptionResponse(committed=committed, uncommitted=[])
+
+    def stream(self, session_id: str) -> Iterator[Word]:
+        """Transcribe the pending window, if ready, yielding words as segments complete"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
+
+        with session.lock:
+            window = self._claim_window(session)
+
+        if window is not None:
+            yield from self._transcribe_window(session, *window)
 
     def end_session(self, session_id: str):
         """End and cleanup session"""
-        if session_id in self.sessions:
+        # Detach first so no more chunks can be added
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
             # Final transcription of any remaining audio
-            session = self.sessions[session_id]
-            if len(session["audio_buffer"]) > 0:
+            with session.lock:
+                audio_buffer = ring_read(session.ring, session.read_idx, session.write_idx)
+
+            if audio_buffer.size > 0:
                 try:
-                    segments, _ = self.model.transcribe(
-                        session["audio_buffer"],
-                        language=session["language"],
-                        beam_size=1
+                    segments, _ = self._transcribe(
+                        audio_buffer,
+                        language=session.language,
+                        beam_size=1,
+                        temperature=[0.0, 0.2, 0.4],
+                        vad_filter=True,
+                        vad_parameters=dict(min_silence_duration_ms=500)
                     )
-                    for segment in segments:
-                        if segment.text.strip():
-                            session["committed_text"].append(segment.text.strip())
+                    session.commit([
+                        segment.text.strip() for segment in segments if segment.text.strip()
+                    ])
                 except Exception as e:
                     print(f"⚠️ Final transcription error: {e}")
 
-            del self.sessions[session_id]
             print(f"✅ Session ended: {session_id}")
 
     def clear_session(self, session_id: str):
         """Clear session buffers"""
-        if session_id not in self.sessions:
-            raise ValueError(f"Session {session_id} not found")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(f"Session {session_id} not found")
 
-        session = self.sessions[session_id]
-        session["audio_buffer"] = np.array([], dtype=np.float32)
-        session["committed_text"] = []
-        session["last_transcription"] = ""
+        with session.lock:
+            session.generation += 1
+            # Fresh ring so an in-flight transcription never sees new audio
+            session.ring = np.zeros(self.ring_size, dtype=np.float32)
+            session.read_idx = session.write_idx
+            session.committed_text = []
+            session.cached_not_ready = TranscriptionResponse(committed=[], uncommitted=[])
+            session.last_processed_idx = session.write_idx
+            session.cached_response = TranscriptionResponse(committed=[], uncommitted=[])
 
 
 # ============================================================================
 # FastAPI Application
 # ============================================================================
 
-# Global manager instance
-manager: Optional[StreamingManager] = None
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global manager
-
     # Startup
     print("🚀 Starting TheWhisper Backend...")
     model_name = os.getenv("MODEL_NAME", "TheStageAI/thewhisper-large-v3-turbo")
-    chunk_length = int(os.getenv("CHUNK_LENGTH_S", "15"))
+
+    # Transcription is CPU-bound and blocking - keep it off the event loop
+    transcribe_workers = int(os.getenv("TRANSCRIBE_WORKERS", "2"))
+    app.state.transcribe_pool = ThreadPoolExecutor(
+        max_workers=transcribe_workers,
+        thread_name_prefix="transcribe"
+    )
 
     if PLATFORM_AVAILABLE:
-        manager = StreamingManager(model_name=model_name, chunk_length_s=chunk_length)
+        app.state.manager = StreamingManager(model_name=model_name)
         print(f"✅ Model loaded: {model_name}")
-        print(f"✅ Chunk length: {chunk_length}s")
+        print(f"✅ Chunk length: {CHUNK_LENGTH_S}s")
     else:
+        app.state.manager = None
         print("⚠️  Running in mock mode - transcription not available")
 
     yield
 
     # Shutdown
     print("🛑 Shutting down TheWhisper Backend...")
+    manager = app.state.manager
     if manager:
         # End all active sessions
         for session_id in list(manager.sessions.keys()):
             manager.end_session(session_id)
+    app.state.transcribe_pool.shutdown(wait=True)
 
 
 # Create FastAPI app
@@ -283,6 +562,7 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint"""
+    manager = app.state.manager
     return {
         "status": "healthy",
         "platform": platform,
@@ -291,42 +571,102 @@ async def health():
     }
 
 
-@app.post("/session/create/", response_model=SessionResponse)
+# Session endpoints below are registered once PLATFORM_AVAILABLE is known,
+# so they can rely on app.state.manager being set
+
 async def create_session(request: SessionCreateRequest):
     """Create a new transcription session"""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Service not available")
-
     try:
-        session_id = manager.create_session(language=request.language)
+        session_id = app.state.manager.create_session(language=request.language)
         return SessionResponse(session_id=session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/session/{session_id}/add_chunk")
-async def add_chunk(session_id: str, base64: str = Query(...)):
-    """Add audio chunk to session"""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Service not available")
-
+async def add_chunk(
+    session_id: str,
+    request: Request,
+    base64: Optional[str] = Query(None),
+    encoding: str = Query("f32", pattern=ENCODING_PATTERN)
+):
+    """
+    Add audio chunk to session
+
+    The body is raw PCM when sent as application/octet-stream, base64
+    otherwise. `encoding` selects float32 (`f32`) or int16 (`s16`) samples.
+    The legacy `base64` query parameter is still accepted.
+    """
+    manager = app.state.manager
     try:
-        manager.add_chunk(session_id, base64)
+        if base64 is not None:
+            manager.add_chunk(session_id, base64, encoding)
+        else:
+            body = await request.body()
+            if request.headers.get("content-type", "").startswith("application/octet-stream"):
+                manager.add_chunk_bytes(session_id, body, encoding)
+            else:
+                manager.add_chunk(session_id, body, encoding)
         return {"status": "success"}
-    except ValueError as e:
+    except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # Malformed audio: empty, bad base64 or partial samples
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/session/{session_id}/process", response_model=TranscriptionResponse)
+async def session_websocket(
+    websocket: WebSocket,
+    session_id: str,
+    encoding: str = Query(..., pattern=ENCODING_PATTERN)
+):
+    """
+    Stream audio to a session over a persistent WebSocket
+
+    Binary frames are raw PCM chunks in `encoding`, which is required here:
+    there is no legacy client whose format a default would have to match.
+    A "process" text frame replies with the current transcription as JSON.
+    """
+    manager = app.state.manager
+    if session_id not in manager.sessions:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                manager.add_chunk_bytes(session_id, message["bytes"], encoding)
+            elif message.get("text") == "process":
+                # Only a ready window goes to the transcribe pool
+                result = manager.poll(session_id) or await loop.run_in_executor(
+                    app.state.transcribe_pool, manager.process, session_id
+                )
+                await websocket.send_json(result.model_dump())
+    except ValueError as e:
+        # Session ended or malformed audio
+        await websocket.close(code=1008, reason=str(e))
+
+
 async def process_session(session_id: str):
     """Get current transcription results"""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Service not available")
-
     try:
-        result = manager.process(session_id)
+        manager = app.state.manager
+        # Cache hits and not-ready polls are answered here; only a ready
+        # window goes to the transcribe pool
+        result = manager.poll(session_id)
+        if result is None:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                app.state.transcribe_pool, manager.process, session_id
+            )
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -334,27 +674,59 @@ async def process_session(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/session/{session_id}/end")
+async def stream_session(session_id: str):
+    """
+    Stream the next window's words as Server-Sent Events while it is transcribed
+
+    Words are sent before the window is committed: if transcription fails
+    partway, the window is retried and its words may be sent again.
+    """
+    manager = app.state.manager
+    if session_id not in manager.sessions:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+
+    loop = asyncio.get_running_loop()
+    words: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        """Run the blocking transcription, handing each word to the event loop"""
+        try:
+            for word in manager.stream(session_id):
+                loop.call_soon_threadsafe(words.put_nowait, word)
+        finally:
+            loop.call_soon_threadsafe(words.put_nowait, None)
+
+    async def events():
+        while (word := await words.get()) is not None:
+            yield f"data: {word.model_dump_json()}\n\n"
+
+    def log_failure(future: asyncio.Future):
+        """Surface producer errors, e.g. the session ending before it started"""
+        if not future.cancelled() and future.exception():
+            print(f"⚠️ Stream error for session {session_id}: {future.exception()}")
+
+    # Runs to completion even if the client disconnects, so the window is still committed
+    producer = loop.run_in_executor(app.state.transcribe_pool, produce)
+    producer.add_done_callback(log_failure)
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 async def end_session(session_id: str):
     """End transcription session"""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Service not available")
-
     try:
-        manager.end_session(session_id)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            app.state.transcribe_pool, app.state.manager.end_session, session_id
+        )
         return {"status": "ended"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/session/{session_id}/clear")
 async def clear_session(session_id: str):
     """Clear session buffers"""
-    if not manager:
-        raise HTTPException(status_code=503, detail="Service not available")
-
     try:
-        manager.clear_session(session_id)
+        app.state.manager.clear_session(session_id)
         return {"status": "cleared"}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -362,6 +734,39 @@ async def clear_session(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Built once and reused for every request while transcription is unavailable
+SERVICE_UNAVAILABLE = JSONResponse({"detail": "Service not available"}, status_code=503)
+
+
+async def service_unavailable():
+    """Session endpoint stand-in when the Whisper platform is missing"""
+    return SERVICE_UNAVAILABLE
+
+
+async def session_websocket_unavailable(websocket: WebSocket):
+    """WebSocket stand-in when the Whisper platform is missing"""
+    await websocket.close(code=1013)  # Try again later
+
+
+SESSION_ROUTES = [
+    ("/session/create/", create_session, "POST", SessionResponse),
+    ("/session/{session_id}/add_chunk", add_chunk, "POST", None),
+    ("/session/{session_id}/process", process_session, "POST", TranscriptionResponse),
+    ("/session/{session_id}/stream", stream_session, "GET", None),
+    ("/session/{session_id}/end", end_session, "POST", None),
+    ("/session/{session_id}/clear", clear_session, "POST", None),
+]
+
+if PLATFORM_AVAILABLE:
+    for path, endpoint, method, response_model in SESSION_ROUTES:
+        app.add_api_route(path, endpoint, methods=[method], response_model=response_model)
+    app.add_api_websocket_route("/session/{session_id}/ws", session_websocket)
+else:
+    for path, _, method, _ in SESSION_ROUTES:
+        app.add_api_route(path, service_unavailable, methods=[method])
+    app.add_api_websocket_route("/session/{session_id}/ws", session_websocket_unavailable)
+
+
 # ============================================================================
 # Signal Handlers
 # ============================================================================
@@ -382,4 +787,26 @@ signal.signal(signal.SIGTERM, signal_handler)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # uvloop and httptools ship with uvicorn[standard]; fall back if missing
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    # Each worker is a separate process loading its own Whisper model (RAM x workers)
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    uvicorn.run(
+        "server:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop=loop,
+        http=http,
+        workers=workers
+    )
@@ -158,13 +158,13 @@ const WhisperTranscription = () => {
       if (!newSessionId) return
 
       // Create inline callback with fresh sessionId to avoid closure issues
-      const sendChunk = async audioBase64 => {
+      const sendChunk = async audioData => {
         // eslint-disable-next-line no-console
         console.log(
           '[sendChunk] Called with sessionId:',
           newSessionId,
           'audio length:',
-          audioBase64?.length
+          audioData?.length
         )
 
         try {
@@ -175,11 +175,11 @@ const WhisperTranscription = () => {
           )
 
           const response = await fetch(
-            `${BACKEND_URL}/session/${newSessionId}/add_chunk`,
+            `${BACKEND_URL}/session/${newSessionId}/add_chunk?encoding=s16`,
             {
               method: 'POST',
-              headers: { 'Content-Type': 'application/json' },
-              body: JSON.stringify({ audio_base64: audioBase64 })
+              headers: { 'Content-Type': 'application/octet-stream' },
+              body: audioData
             }
           )
 
@@ -18,22 +18,22 @@ export const useAudioCapture = () => {
   const audioChunksRef = useRef([])
 
   /**
-   * Convert Float32Array to base64 string
-   * @param {Float32Array} float32Array - Audio data
-   * @returns {string} Base64 encoded audio
+   * Convert Float32Array samples to 16-bit PCM
+   * @param {Float32Array} float32Array - Audio data in [-1, 1]
+   * @returns {Int16Array} 16-bit PCM audio
    */
-  const float32ToBase64 = float32Array => {
-    // Create a buffer from Float32Array
-    const buffer = float32Array.buffer
-    // Convert to binary string
-    const binary = String.fromCharCode(...new Uint8Array(buffer))
-    // Encode to base64
-    return btoa(binary)
+  const float32ToInt16 = float32Array => {
+    const int16Array = new Int16Array(float32Array.length)
+    for (let i = 0; i < float32Array.length; i++) {
+      const sample = Math.max(-1, Math.min(1, float32Array[i]))
+      int16Array[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff
+    }
+    return int16Array
   }
 
   /**
    * Start audio capture
-   * @param {Function} onAudioChunk - Callback for each audio chunk (receives base64 string)
+   * @param {Function} onAudioChunk - Callback for each audio chunk (receives an Int16Array)
    */
   const startRecording = useCallback(async onAudioChunk => {
     try {
@@ -197,15 +197,9 @@ registerProcessor('whisper-audio-processor', WhisperAudioProcessor)
           // Store chunk
           audioChunksRef.current.push(audioData)
 
-          // Convert to base64 and call callback
+          // Hand 16-bit PCM to the callback (half the bytes of float32)
           if (onAudioChunk) {
-            const base64Audio = float32ToBase64(audioData)
-            // eslint-disable-next-line no-console
-            console.log(
-              '[useAudioCapture] Sending base64 audio, length:',
-              base64Audio.length
-            )
-            onAudioChunk(base64Audio)
+            onAudioChunk(float32ToInt16(audioData))
           }
         }
       }